@@ -0,0 +1,17 @@
+-- Bring an articles table created by an older version up to the current models.
+-- create_all only creates missing tables; it never alters existing ones.
+-- Run once: psql -U <user> -d db_6g -f backend/migrations/001_articles_column_types.sql
+BEGIN;
+
+-- key_points was json.dumps() text; store it as JSONB
+ALTER TABLE articles ALTER COLUMN key_points TYPE jsonb USING key_points::jsonb;
+
+-- publish_date was free text (ISO dates in practice); anything unparseable becomes NULL
+ALTER TABLE articles ALTER COLUMN publish_date TYPE date
+    USING CASE WHEN publish_date ~ '^\d{4}-\d{2}-\d{2}' THEN substring(publish_date from 1 for 10)::date END;
+
+CREATE INDEX IF NOT EXISTS ix_articles_publish_date ON articles (publish_date);
+CREATE INDEX IF NOT EXISTS ix_articles_week ON articles (week);
+CREATE INDEX IF NOT EXISTS ix_articles_created_at ON articles (created_at);
+
+COMMIT;
@@ -1,32 +1,35 @@
 from backend.db import Base, session
-from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
-import json
 
 class Article(Base):
     __tablename__ = 'articles'
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
     authors = Column(String(500))
-    publish_date = Column(String(100))
+    publish_date = Column(Date, index=True)
     link = Column(String(500))
     summary = Column(Text)
-    key_points = Column(Text)
-    week = Column(String(10))
-    created_at = Column(DateTime, default=datetime.now)
+    key_points = Column(JSONB)  # Stored decoded; no json round-trip on read/write
+    week = Column(String(10), index=True)
+    created_at = Column(DateTime, default=datetime.now, index=True)
     __table_args__ = (UniqueConstraint('link', 'week', name='unique_link_week'),)  # Allow global duplicates but not per week
 
     def to_dict(self):
+        # Read the date columns once each instead of twice
+        publish_date = self.publish_date
+        created_at = self.created_at
         return {
             'id': self.id,
             'title': self.title,
             'authors': self.authors,
-            'publish_date': self.publish_date,
+            'publish_date': publish_date.isoformat() if publish_date else None,
             'link': self.link,
             'summary': self.summary,
-            'key_points': json.loads(self.key_points) if self.key_points else [],
+            'key_points': self.key_points or [],
             'week': self.week,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': created_at.isoformat() if created_at else None
         }
 
 # New Models for Tracking (unchanged)
@@ -1,15 +1,36 @@
-from flask import Blueprint, jsonify, send_file, request
+from flask import Blueprint, Response, jsonify, send_file, request, stream_with_context
+from . import scheduler
 from .scheduler import run_weekly_job
 from .models import Article
-from .db import db
+from .db import session as db_session
+from sqlalchemy import select, text
+import hashlib
+import json
 import os
+import re
+import threading
+import time
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
+# week -> (expires_at, job_run, body, etag). Entries built before the last run_weekly_job in this
+# process are ignored; other processes pick up new data when the TTL runs out.
+ARTICLES_CACHE_TTL = 600
+ARTICLES_CACHE_MAX_ENTRIES = 64
+ARTICLES_CACHE_MAX_BYTES = 1 << 20  # larger weeks are streamed and not cached
+_articles_cache = {}
+_articles_cache_lock = threading.Lock()
+WEEK_RE = re.compile(r'^\d{4}-\d{2}$')
+
+@api.teardown_app_request
+def remove_db_session(exception=None):
+    # Per-request session scope; also clears a transaction left failed by /health
+    db_session.remove()
+
 @api.route('/health')
 def health():
     try:
-        db.session.execute('SELECT 1')
+        db_session.execute(text('SELECT 1'))
         return jsonify({'status': 'ok', 'db': 'connected'})
     except Exception as e:
         return jsonify({'status': 'error', 'db': 'disconnected', 'error': str(e)}), 500
@@ -27,8 +48,50 @@ def get_articles():
     week = request.args.get('week')
     if not week:
         return jsonify({'status': 'error', 'message': 'Week parameter required'}), 400
-    articles = Article.query.filter_by(week=week).all()
-    return jsonify([a.to_dict() for a in articles])
+    if not WEEK_RE.match(week):
+        return jsonify({'status': 'error', 'message': 'Week must look like YYYY-WW'}), 400
+    job_run = scheduler.job_runs
+    cached = _articles_cache.get(week)
+    if cached and cached[0] > time.monotonic() and cached[1] == job_run:
+        return _articles_response(cached[2], cached[3])
+
+    # Build the body in memory up to the cache cap; past it, stream the rest row by row
+    stmt = select(Article).where(Article.week == week).execution_options(yield_per=100)
+    rows = iter(db_session.scalars(stmt))
+    chunks = []
+    size = 2
+    for a in rows:
+        chunk = json.dumps(a.to_dict(), default=str)
+        chunks.append(chunk)
+        size += len(chunk) + 1
+        if size > ARTICLES_CACHE_MAX_BYTES:
+            return Response(stream_with_context(_stream_articles(chunks, rows)), mimetype='application/json')
+
+    body = '[' + ','.join(chunks) + ']'
+    etag = hashlib.md5(body.encode('utf-8')).hexdigest()
+    _store_articles(week, (time.monotonic() + ARTICLES_CACHE_TTL, job_run, body, etag))
+    return _articles_response(body, etag)
+
+def _articles_response(body, etag):
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def _stream_articles(chunks, rows):
+    yield '[' + ','.join(chunks)
+    for a in rows:
+        yield ',' + json.dumps(a.to_dict(), default=str)
+    yield ']'
+
+def _store_articles(week, entry):
+    with _articles_cache_lock:
+        if week not in _articles_cache and len(_articles_cache) >= ARTICLES_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for key in [k for k, v in _articles_cache.items() if v[0] <= now or v[1] != entry[1]]:
+                del _articles_cache[key]
+            if len(_articles_cache) >= ARTICLES_CACHE_MAX_ENTRIES:
+                del _articles_cache[next(iter(_articles_cache))]  # oldest insert
+        _articles_cache[week] = entry
 
 @api.route('/articles/json')
 def get_articles_json():
@@ -37,6 +100,14 @@ def get_articles_json():
         return jsonify({'status': 'error', 'message': 'Week parameter required'}), 400
     json_file = f"articles_week_{week}.json"
     if os.path.exists(json_file):
-        return send_file(json_file, mimetype='application/json')
+        gz_file = f"{json_file}.gz"
+        if 'gzip' in request.headers.get('Accept-Encoding', '') and os.path.exists(gz_file):
+            response = send_file(gz_file, mimetype='application/json', conditional=True, max_age=3600)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_file(json_file, mimetype='application/json', conditional=True, max_age=3600)
+        # On both variants, so shared caches keep the plain and gzip copies apart
+        response.vary.add('Accept-Encoding')
+        return response
     else:
         return jsonify({'status': 'error', 'message': f'No JSON file found for week {week}'}), 404
@@ -1,50 +1,111 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from .searcher import weekly_search
-from .summarizer import generate_summary
+from .searcher import weekly_search, mark_reported
+from .summarizer import summarize_all
 from .models import Article
-from .db import db
+from .db import engine
 from datetime import datetime
-import json
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.orm import Session
+import orjson
+import gzip
 import logging
-import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Built once at import; the expanding bind keeps a single cache key whatever the list length
+EXISTING_LINKS_STMT = select(Article.link).where(Article.link.in_(bindparam('links', expanding=True)))
+WEEK_ARTICLES_STMT = (select(Article).where(Article.week == bindparam('week'))
+                      .order_by(Article.created_at, Article.id).execution_options(yield_per=100))
+
+# Bumped after each run that saved articles; readers use it to drop data cached before the run
+job_runs = 0
+
 def run_weekly_job():
+    global job_runs
     logger.info("Starting weekly job")
-    week = datetime.now().strftime('%Y-%W')
-    articles = weekly_search()
-    saved_count = 0
-    for article in articles:
-        logger.info(f"Processing article: {article['title'][:50]}...")
-        with db.session.no_autoflush:  # Prevent autoflush during duplicate check
-            if Article.query.filter_by(link=article['link']).first():
-                logger.info(f"Skipping duplicate: {article['title'][:50]}")
-                continue
-        summary_data = generate_summary(article['full_text'])
-        logger.info(f"Summary for {article['title'][:50]}: summary={summary_data['summary'][:100]}..., key_points={summary_data['key_points']}")
-        new_article = Article(
-            title=article['title'],
-            authors=article['authors'],
-            publish_date=article['publish_date'],
-            link=article['link'],
-            summary=summary_data['summary'],
-            key_points=json.dumps(summary_data['key_points']),
-            week=week
-        )
-        db.session.add(new_article)
-        saved_count += 1
-    db.session.commit()
-    logger.info(f"Saved {saved_count} articles for week {week}")
-
-    # Export current week's articles to JSON
-    current_week_articles = Article.query.filter_by(week=week).all()
-    json_data = [a.to_dict() for a in current_week_articles]
-    json_file = f"articles_week_{week}.json"
-    with open(json_file, 'w') as f:
-        json.dump(json_data, f, indent=2)
-    logger.info(f"Exported {len(json_data)} articles to {json_file}")
+    now = datetime.now()  # single clock read; reused for week_str and every created_at
+    iso = now.isocalendar()
+    week_str = f"{iso[0]}-{iso[1]:02d}"
+    logger.info(f"Computed week: {week_str}")
+
+    # Step 1: Get top 50 most relevant articles (last 12 months)
+    candidates = weekly_search()
+    logger.info(f"Received {len(candidates)} candidate articles from searcher")
+
+    # Step 2: Select up to 8 NEW articles (not in DB)
+    # One IN query for all candidate links instead of one query per article
+    links = [a['link'] for a in candidates]
+    # Short-lived sessions: no connection is held while searching/summarizing,
+    # and nothing accumulates in the scoped session's identity map
+    with Session(engine) as db:
+        existing_links = set(db.scalars(EXISTING_LINKS_STMT, {'links': links}))
+
+    # Filter everything cheap before the expensive summarization step
+    fresh = []
+    for a in candidates:
+        if a['link'] not in existing_links:
+            existing_links.add(a['link'])  # also drops repeated links within this batch
+            fresh.append(a)
+    logger.info(f"Skipping {len(candidates) - len(fresh)} candidates already in DB")
+    new_articles = fresh[:8]
+
+    # Generate summaries concurrently – each call is an independent Ollama request
+    summaries = summarize_all(new_articles)
+
+    rows = []
+    saved = []
+    for article, summary_data in zip(new_articles, summaries):
+        title = article['title']
+        if summary_data is None:
+            continue
+        saved.append(article)
+        logger.info(f"Summary generated for: {title[:60]}")
+
+        # Truncate fields
+        authors = (article['authors'] or '')[:500]
+        rows.append({
+            'title': article['title'][:500],
+            'authors': authors,
+            'publish_date': article['publish_date'],
+            'link': article['link'],
+            'summary': summary_data['summary'],
+            'key_points': summary_data['key_points'],
+            'week': week_str,
+            'created_at': now
+        })
+
+    # Step 3: Commit to DB – one multi-row INSERT instead of per-row session.add
+    if rows:
+        with Session(engine) as db:
+            db.execute(insert(Article), rows)
+            db.commit()
+        job_runs += 1
+        mark_reported(saved)
+        logger.info(f"Saved {len(rows)} new articles to DB for week {week_str}")
+    else:
+        logger.info("No new articles to save this week")
+
+    # Step 4: Export the whole week to JSON – earlier runs this week included
+    json_file = f"articles_week_{week_str}.json"
+    # Stream the rows from the DB into both files; the pre-compressed copy is
+    # served to clients that accept gzip
+    with Session(engine) as db, \
+            open(json_file, 'wb', buffering=1 << 20) as f, \
+            gzip.open(f"{json_file}.gz", 'wb', compresslevel=6) as gz:
+        f.write(b'[')
+        gz.write(b'[')
+        exported = 0
+        for article in db.scalars(WEEK_ARTICLES_STMT, {'week': week_str}):
+            chunk = orjson.dumps(article.to_dict())
+            if exported:
+                chunk = b',' + chunk
+            f.write(chunk)
+            gz.write(chunk)
+            exported += 1
+        f.write(b']')
+        gz.write(b']')
+    logger.info(f"Exported {exported} articles to {json_file}")
 
 def init_scheduler():
     scheduler = BackgroundScheduler()
@@ -1,16 +1,24 @@
 # backend/searcher.py
 import requests
-import feedparser
+from requests.adapters import HTTPAdapter
 from scholarly import scholarly
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from datetime import datetime, timedelta
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception
+from datetime import date, datetime, timedelta
 import logging
 import time
-import urllib.parse
-import arxiv
+import feedparser
 import os
-import json
+import orjson
 import pathlib
+import re
+import functools
+import operator
+import gzip
+import hashlib
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 
 # ----------------------------------------------------------------------
 # API keys – try config.py first, then environment variables
@@ -28,6 +36,16 @@ except ImportError:
     if not IEEE_API_KEY:
         logging.getLogger(__name__).warning("IEEE_API_KEY not set – IEEE Xplore search will be skipped")
 
+# Providers that can't succeed in this environment are never scheduled
+SKIP_SOURCES = {'openalex'}  # 403s for this app
+if not ELSEVIER_API_KEY:
+    SKIP_SOURCES.add('sciencedirect')
+if not IEEE_API_KEY:
+    SKIP_SOURCES.add('ieee')
+
+# Google Scholar scraping is slow and often blocked; opt in with ENABLE_SCHOLAR=1
+ENABLE_SCHOLAR = os.getenv('ENABLE_SCHOLAR') == '1'
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -49,266 +67,453 @@ headers = {
     'Accept': 'application/json'
 }
 
+# One keep-alive session for every provider so TCP/TLS handshakes are reused;
+# the pool is sized for the concurrent fetches and Unpaywall lookups
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
 def _safe_str(val):
     return '' if val is None else str(val)
+
+def _fmt_authors(names):
+    """', '-joined names; past 1000 chars, cut to 950 + ' ... et al.'.
+    Stops consuming names once over the limit instead of joining them all."""
+    out = []
+    size = -2
+    for name in names:
+        out.append(name)
+        size += len(name) + 2
+        if size > 1000:
+            return ', '.join(out)[:950] + ' ... et al.'
+    return ', '.join(out)
+
+# ----------------------------------------------------------------------
+# Per-host request pacing (replaces the old global sleep between keywords)
+# ----------------------------------------------------------------------
+class RateLimiter:
+    """Space calls at least period/rate seconds apart, shared across threads."""
+    def __init__(self, rate, period=1.0):
+        self.interval = period / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+RATE_LIMITS = {
+    'arxiv': RateLimiter(1, 3),  # arXiv asks for one request every 3 seconds
+    'semantic': RateLimiter(1),
+    'core': RateLimiter(10),
+    'crossref': RateLimiter(50),
+    'sciencedirect': RateLimiter(2),
+    'ieee': RateLimiter(10),
+    'unpaywall': RateLimiter(10),
+}
+
+# ----------------------------------------------------------------------
+# Retry policy shared by every HTTP provider
+# ----------------------------------------------------------------------
+RETRYABLE_ERRORS = (requests.exceptions.HTTPError, requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError)
+# Other 4xx (bad key, bad query) fail the same way on every attempt
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+def _is_transient(exc):
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return getattr(exc.response, 'status_code', None) in RETRYABLE_STATUS
+    return isinstance(exc, RETRYABLE_ERRORS)
+_backoff = wait_random_exponential(multiplier=1, max=60)
+
+def _wait_retry_after(retry_state):
+    """Honour the server's Retry-After header, else exponential backoff with jitter."""
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.isdigit():
+        return min(int(retry_after), 60)
+    return _backoff(retry_state)
+
+def _give_up(retry_state):
+    logger.error(f"{retry_state.fn.__name__} gave up after {retry_state.attempt_number} attempts: "
+                 f"{retry_state.outcome.exception()}")
+    return []
+
+http_retry = retry(stop=stop_after_attempt(5), wait=_wait_retry_after,
+                   retry=retry_if_exception(_is_transient), retry_error_callback=_give_up)
+# Same policy for lookups whose caller must tell "no answer" from "couldn't ask": re-raises at the end
+lookup_retry = retry(stop=stop_after_attempt(5), wait=_wait_retry_after,
+                     retry=retry_if_exception(_is_transient), reraise=True)
+
+# ----------------------------------------------------------------------
+# On-disk result cache keyed by (provider, query)
+# ----------------------------------------------------------------------
+CACHE_DIR = pathlib.Path("backend/backup/cache")
+CACHE_TTL = 24 * 3600
+
+def disk_cache(provider):
+    """Serve a search function's results from disk for CACHE_TTL seconds.
+    Empty results are not cached, since every provider returns [] on error."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(query, max_results=30):
+            key = hashlib.sha1(f"{provider}|{query}|{max_results}".encode('utf-8')).hexdigest()
+            path = CACHE_DIR / f"{provider}_{key}.json"
+            try:
+                if time.time() - path.stat().st_mtime < CACHE_TTL:
+                    articles = orjson.loads(path.read_bytes())
+                    for a in articles:
+                        if a['publish_date']:
+                            a['publish_date'] = date.fromisoformat(a['publish_date'])
+                    logger.info(f"{provider} cache hit for query '{query}'")
+                    return articles
+            except (OSError, ValueError, KeyError):
+                pass
+            articles = fn(query, max_results)
+            if articles:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(orjson.dumps(articles, default=str))
+            return articles
+        return wrapper
+    return decorator
+# Providers are asked only for papers published in the last FETCH_WINDOW_DAYS;
+# older candidates come from the previous week's backup
+FETCH_WINDOW_DAYS = 14
+
+def fetch_since():
+    return date.today() - timedelta(days=FETCH_WINDOW_DAYS)
 # ----------------------------------------------------------------------
 # Search functions (unchanged except for safe strings & CORE key)
 # ----------------------------------------------------------------------
+# arXiv's export API is a plain Atom feed; fetching it through SESSION shares the
+# pooled connections, RATE_LIMITS pacing and http_retry with the other providers
+ARXIV_API = 'https://export.arxiv.org/api/query'
+
+@disk_cache('arxiv')
+@http_retry
 def arxiv_search(query='6G', max_results=30):
     try:
-        client = arxiv.Client()
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance,
-            sort_order=arxiv.SortOrder.Descending
-        )
-        results = list(client.results(search))
+        params = {
+            'search_query': f"({query}) AND submittedDate:[{fetch_since():%Y%m%d}0000 TO {date.today():%Y%m%d}2359]",
+            'max_results': max_results,
+            'sortBy': 'relevance',
+            'sortOrder': 'descending'
+        }
+        RATE_LIMITS['arxiv'].wait()
+        resp = SESSION.get(ARXIV_API, params=params, timeout=30)
+        resp.raise_for_status()
+        feed = feedparser.parse(resp.content)
         articles = []
-        for r in results:
-            authors = ', '.join([a.name for a in r.authors])
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
+        for e in feed.entries:
+            authors = _fmt_authors(a.get('name', '') for a in e.get('authors', []))
+            published = e.get('published')
             articles.append({
-                'title': _safe_str(r.title),
+                'title': ' '.join(_safe_str(e.get('title')).split()),
                 'authors': authors,
-                'publish_date': r.published.date() if r.published else None,
-                'link': f"http://arxiv.org/abs/{r.entry_id.split('/')[-1]}",
-                'full_text': _safe_str(r.summary)
+                'publish_date': date.fromisoformat(published[:10]) if published else None,
+                'link': f"http://arxiv.org/abs/{e.get('id', '').split('/abs/')[-1]}",
+                'full_text': _safe_str(e.get('summary'))
             })
         logger.info(f"arXiv fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
+        if _is_transient(e):
+            raise  # handled by http_retry
         logger.error(f"arXiv error for query '{query}': {e}")
         return []
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
-       retry=retry_if_exception_type(requests.exceptions.HTTPError))
-def semantic_search(query='6G wireless communication', max_results=30):
-    url = 'https://api.semanticscholar.org/graph/v1/paper/search'
-    params = {
-        'query': urllib.parse.quote(query),
-        'limit': max_results,
-        'fields': 'title,authors,publicationDate,url,abstract',
-        'sort': 'relevance'
-    }
+SEMANTIC_API = 'https://api.semanticscholar.org/graph/v1/paper'
+SEMANTIC_FIELDS = 'title,authors,publicationDate,url,abstract'
+
+# Re-raises once retries run out: a chain missing a page must not be cached as complete
+@lookup_retry
+def _semantic_bulk_page(query, token=None):
+    # /search/bulk returns the requested fields directly, up to 1000 per page
+    params = {'query': query, 'fields': SEMANTIC_FIELDS,
+              'publicationDateOrYear': f"{fetch_since().isoformat()}:"}
+    if token:
+        params['token'] = token
+    RATE_LIMITS['semantic'].wait()
+    resp = SESSION.get(f'{SEMANTIC_API}/search/bulk', params=params, timeout=30)
+    if resp.status_code == 429:
+        logger.warning(f"Semantic Scholar rate limit (429) for bulk query '{query}'")
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+# Safety stop only; the fetch window normally ends the token chain after a page or two
+SEMANTIC_MAX_PAGES = 10
+
+@disk_cache('semantic')
+def semantic_search(queries=('6G wireless communication',), max_results=30):
+    """Search Semantic Scholar for all queries at once with one OR'd bulk query.
+    Bulk results come back in no particular order, so max_results is not applied: every
+    page in the fetch window is returned, and weekly_search ranks them by relevance_score
+    along with the other providers' results. Any failed page makes the whole call return []."""
     try:
-        resp = requests.get(url, params=params, timeout=10, headers=headers)
-        if resp.status_code == 429:
-            logger.warning(f"Semantic Scholar rate limit (429) for query '{query}'")
-            return []
-        resp.raise_for_status()
-        data = resp.json()
+        bulk_query = ' | '.join(f'"{q}"' for q in queries)
         articles = []
-        for p in data.get('data', []):
-            authors = ', '.join(a['name'] for a in p.get('authors', []))
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
-            articles.append({
-                'title': _safe_str(p.get('title')),
-                'authors': authors,
-                'publish_date': datetime.strptime(p['publicationDate'], '%Y-%m-%d').date()
-                                if p.get('publicationDate') else None,
-                'link': p.get('url') or '',
-                'full_text': _safe_str(p.get('abstract'))
-            })
-        logger.info(f"Semantic Scholar fetched {len(articles)} articles for query '{query}'")
+        token = None
+        for _ in range(SEMANTIC_MAX_PAGES):
+            page = _semantic_bulk_page(bulk_query, token)
+            for p in page.get('data', []):
+                authors = _fmt_authors(a['name'] for a in p.get('authors', []))
+                articles.append({
+                    'title': _safe_str(p.get('title')),
+                    'authors': authors,
+                    'publish_date': date.fromisoformat(p['publicationDate'][:10])
+                                    if p.get('publicationDate') else None,
+                    'link': p.get('url') or '',
+                    'full_text': _safe_str(p.get('abstract'))
+                })
+            token = page.get('token')
+            if not token:
+                break
+        else:
+            logger.warning(f"Semantic Scholar stopped after {SEMANTIC_MAX_PAGES} pages; later results skipped")
+        logger.info(f"Semantic Scholar fetched {len(articles)} articles for {len(queries)} queries")
         return articles
     except Exception as e:
-        logger.error(f"Semantic Scholar error for query '{query}': {e}")
+        logger.error(f"Semantic Scholar error for queries {list(queries)}: {e}")
         return []
 
 def openalex_search(*_):
     logger.info("OpenAlex is disabled (403).")
     return []
 
+# scholarly paces its own page requests; we only back off after a bad result
+SCHOLAR_MIN_DELAY = 1
+SCHOLAR_MAX_DELAY = 30
+
+@disk_cache('scholar')
 def scholarly_search(query='6G wireless communication', max_results=30):
     try:
         articles = []
-        for i, res in enumerate(scholarly.search_pubs(query)):
+        delay = 0
+        for i, res in enumerate(scholarly.search_pubs(query, year_low=fetch_since().year)):
             if i >= max_results:
                 break
             try:
-                authors = ', '.join(res['bib'].get('author', []))
-                if len(authors) > 1000:
-                    authors = authors[:950] + ' ... et al.'
+                authors = _fmt_authors(res['bib'].get('author', []))
                 articles.append({
                     'title': _safe_str(res['bib'].get('title')),
                     'authors': authors,
-                    'publish_date': datetime.strptime(res['bib']['pub_year'], '%Y').date()
+                    'publish_date': date(int(res['bib']['pub_year']), 1, 1)
                                     if res['bib'].get('pub_year') else None,
                     'link': res.get('eprinturl') or res.get('pub_url') or '',
                     'full_text': _safe_str(res.get('abstract'))
                 })
+                delay = 0
             except Exception as sub_e:
                 logger.warning(f"Skipping malformed Scholar result: {sub_e}")
-                continue
-            time.sleep(1)
+                delay = min(SCHOLAR_MAX_DELAY, max(SCHOLAR_MIN_DELAY, delay * 2))
+                time.sleep(delay)
         logger.info(f"Google Scholar fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
         logger.error(f"Google Scholar error for query '{query}': {e}")
         return []
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=60),
-       retry=retry_if_exception_type(requests.exceptions.HTTPError))
+@disk_cache('core')
+@http_retry
 def core_search(query='6G wireless communication', max_results=30):
     try:
         url = 'https://api.core.ac.uk/v3/search/works'
-        params = {'q': query, 'limit': max_results}
+        # CORE's query language only filters on the year, not the exact date
+        params = {'q': f"({query}) AND yearPublished>={fetch_since().year}", 'limit': max_results}
         if CORE_API_KEY:
             params['apiKey'] = CORE_API_KEY
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        RATE_LIMITS['core'].wait()
+        resp = SESSION.get(url, params=params, timeout=10)
         if resp.status_code == 429:
             logger.warning(f"CORE rate limit (429) for query '{query}'")
-            raise requests.exceptions.HTTPError("429")
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         articles = []
         for item in data.get('results', []):
-            authors_list = item.get('authors', [])
-            authors = ', '.join(
+            get = item.get  # bound once; each item is read 5-8 times
+            title = get('title') or 'No title available'
+            if title == 'No title available':
+                logger.warning(f"Skipping CORE item without title (query: {query})")
+                continue
+            full_text = _safe_str(get('abstract'))
+            if not mentions_keyword(title, full_text):
+                continue  # can't score – skip before building the article
+            authors_list = get('authors', [])
+            authors = _fmt_authors(
                 a.get('name', '') for a in authors_list
                 if isinstance(a, dict) and a.get('name')
             )
             if not authors and isinstance(authors_list, list):
-                authors = ', '.join(str(a) for a in authors_list if isinstance(a, str))
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
-            title = item.get('title', 'No title available')
-            if title == 'No title available':
-                logger.warning(f"Skipping CORE item without title (query: {query})")
-                continue
-            pub_date = item.get('publishedDate')
+                authors = _fmt_authors(str(a) for a in authors_list if isinstance(a, str))
+            pub_date = get('publishedDate')
             date_obj = None
             if pub_date:
                 try:
-                    date_obj = datetime.strptime(pub_date, '%Y-%m-%dT%H:%M:%S').date()
+                    date_obj = date.fromisoformat(pub_date[:10])  # 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM:SS'
                 except ValueError:
-                    try:
-                        date_obj = datetime.strptime(pub_date, '%Y-%m-%d').date()
-                    except ValueError:
-                        logger.warning(f"Bad date format for CORE title '{title}': {pub_date}")
+                    logger.warning(f"Bad date format for CORE title '{title}': {pub_date}")
             articles.append({
                 'title': title,
                 'authors': authors,
                 'publish_date': date_obj,
-                'link': item.get('downloadUrl') or item.get('doi') or 'https://core.ac.uk',
-                'full_text': _safe_str(item.get('abstract'))
+                'link': get('downloadUrl') or get('doi') or 'https://core.ac.uk',
+                'full_text': full_text
             })
         logger.info(f"CORE fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
+        if _is_transient(e):
+            raise  # handled by http_retry
         logger.error(f"CORE error for query '{query}': {e}")
         return []
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=60),
-       retry=retry_if_exception_type(requests.exceptions.HTTPError))
+@disk_cache('sciencedirect')
+@http_retry
 def sciencedirect_search(query='6G wireless communication', max_results=30):
     if not ELSEVIER_API_KEY:
         logger.warning(f"ScienceDirect skipped (no API key) for query '{query}'")
         return []
     try:
         url = 'https://api.elsevier.com/content/search/sciencedirect'
-        hd = headers.copy()
-        hd['X-ELS-APIKey'] = ELSEVIER_API_KEY
-        params = {'query': query, 'count': max_results}
-        resp = requests.get(url, params=params, headers=hd, timeout=10)
+        params = {'query': query, 'count': max_results,
+                  'date': f"{fetch_since().year}-{date.today().year}"}
+        RATE_LIMITS['sciencedirect'].wait()
+        resp = SESSION.get(url, params=params, headers={'X-ELS-APIKey': ELSEVIER_API_KEY}, timeout=10)
         if resp.status_code == 429:
             logger.warning(f"ScienceDirect rate limit (429) for query '{query}'")
-            raise requests.exceptions.HTTPError("429")
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         articles = []
         for item in data.get('search-results', {}).get('entry', []):
-            title = item.get('dc:title', 'No title available')
+            get = item.get
+            title = get('dc:title') or 'No title available'
             if title == 'No title available':
                 logger.warning(f"Skipping ScienceDirect item without title (query: {query})")
                 continue
-            authors = ', '.join(a.get('creator', '') for a in item.get('authors', {}).get('author', []))
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
-            pub_date = item.get('prism:coverDate', '')
+            authors = _fmt_authors(a.get('creator', '') for a in get('authors', {}).get('author', []))
+            pub_date = get('prism:coverDate', '')
             date_obj = None
             if pub_date:
                 try:
-                    date_obj = datetime.strptime(pub_date, '%Y-%m-%d').date()
+                    date_obj = date.fromisoformat(pub_date[:10])
                 except ValueError:
                     logger.warning(f"Bad date for ScienceDirect title '{title}': {pub_date}")
             articles.append({
                 'title': title,
                 'authors': authors,
                 'publish_date': date_obj,
-                'link': item.get('prism:doi') or item.get('link', [{}])[1].get('href', 'https://sciencedirect.com'),
-                'full_text': _safe_str(item.get('dc:description'))
+                'link': get('prism:doi') or get('link', [{}])[1].get('href', 'https://sciencedirect.com'),
+                'full_text': _safe_str(get('dc:description'))
             })
         logger.info(f"ScienceDirect fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
+        if _is_transient(e):
+            raise  # handled by http_retry
         logger.error(f"ScienceDirect error for query '{query}': {e}")
         return []
 
+@disk_cache('crossref')
+@http_retry
 def crossref_search(query='6G wireless communication', max_results=30):
     try:
         url = 'https://api.crossref.org/works'
-        params = {'query': query, 'rows': max_results, 'sort': 'relevance'}
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        params = {'query': query, 'rows': max_results, 'sort': 'relevance',
+                  'filter': f"from-pub-date:{fetch_since().isoformat()}"}
+        RATE_LIMITS['crossref'].wait()
+        resp = SESSION.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         articles = []
         for item in data.get('message', {}).get('items', []):
-            title = item.get('title', ['No title available'])
+            get = item.get
+            title = get('title', ['No title available'])
             title = title[0] if isinstance(title, list) and title else 'No title available'
             if title == 'No title available':
                 logger.warning(f"Skipping Crossref item without title (query: {query})")
                 continue
-            authors = ', '.join(
+            full_text = _safe_str(get('abstract'))
+            if not mentions_keyword(title, full_text):
+                continue  # can't score – skip before building the article
+            authors = _fmt_authors(
                 f"{a.get('family','')} {a.get('given','')}".strip()
-                for a in item.get('author', []) if a.get('family')
+                for a in get('author', []) if a.get('family')
             )
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
-            pub_year = item.get('published', {}).get('date-parts', [[None]])[0][0]
+            pub_year = get('published', {}).get('date-parts', [[None]])[0][0]
             articles.append({
                 'title': title,
                 'authors': authors,
-                'publish_date': datetime.strptime(str(pub_year), '%Y').date() if pub_year else None,
-                'link': item.get('URL', 'https://crossref.org'),
-                'full_text': _safe_str(item.get('abstract'))
+                'publish_date': date(int(pub_year), 1, 1) if pub_year else None,
+                'link': get('URL', 'https://crossref.org'),
+                'full_text': full_text
             })
         logger.info(f"Crossref fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
+        if _is_transient(e):
+            raise  # handled by http_retry
         logger.error(f"Crossref error for query '{query}': {e}")
         return []
 
 # ----------------------------------------------------------------------
 # Unpaywall enrichment (unchanged)
 # ----------------------------------------------------------------------
+UNPAYWALL_CACHE = CACHE_DIR / "unpaywall.json"
+
+@lookup_retry
+def _unpaywall_lookup(doi):
+    """OA PDF url for doi, or None when Unpaywall has none; transport errors raise."""
+    url = f'https://api.unpaywall.org/v2/{doi}?email=amir.gr86@gmail.com'
+    RATE_LIMITS['unpaywall'].wait()
+    r = SESSION.get(url, timeout=5)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return (orjson.loads(r.content).get('best_oa_location') or {}).get('url_for_pdf')
+
 def unpaywall_enrich(articles):
-    enriched = []
+    # Only real DOIs can resolve; answers (including misses) persist across runs
+    try:
+        cache = orjson.loads(UNPAYWALL_CACHE.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    dois = {}
     for a in articles:
-        doi = a['link'].split('abs/')[-1] if 'arxiv' in a['link'] else None
-        if doi:
+        m = DOI_RE.search(a['link'])
+        if m:
+            dois[id(a)] = m.group(0).lower()
+    todo = {doi for doi in dois.values() if doi not in cache}
+
+    # Lookups are independent – overlap their round-trips
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = {doi: pool.submit(_unpaywall_lookup, doi) for doi in todo}
+        for doi, future in futures.items():
             try:
-                url = f'https://api.unpaywall.org/v2/{doi}?email=amir.gr86@gmail.com'
-                r = requests.get(url, timeout=5)
-                if r.status_code == 200:
-                    data = r.json()
-                    oa = data.get('best_oa_location', {}).get('url_for_pdf')
-                    if oa:
-                        a['link'] = oa
-                        logger.info(f"Unpaywall enriched {a['title'][:50]}")
+                cache[doi] = future.result()
             except Exception as e:
-                logger.error(f"Unpaywall error for {a['title'][:50]}: {e}")
-        enriched.append(a)
-    return enriched
+                logger.error(f"Unpaywall error for {doi}: {e}")
+    if todo:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        UNPAYWALL_CACHE.write_bytes(orjson.dumps(cache))
+
+    for a in articles:
+        oa = cache.get(dois.get(id(a)))
+        if oa:
+            a['link'] = oa
+            logger.info(f"Unpaywall enriched {a['title'][:50]}")
+    return articles
 
 #----------------------------------------------------------------------
 # NEW: IEEE Xplore search
 # ----------------------------------------------------------------------
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=60),
-       retry=retry_if_exception_type(requests.exceptions.HTTPError))
+@disk_cache('ieee')
+@http_retry
 def ieee_search(query='6G wireless communication', max_results=30):
     if not IEEE_API_KEY:
         logger.warning(f"IEEE Xplore skipped (no API key) for query '{query}'")
@@ -320,32 +525,33 @@ def ieee_search(query='6G wireless communication', max_results=30):
             'querytext': query,
             'max_records': max_results,
             'start_record': 1,
+            'start_year': fetch_since().year,
             'sort_order': 'desc',
             'sort_field': 'publication_year'
         }
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        RATE_LIMITS['ieee'].wait()
+        resp = SESSION.get(url, params=params, timeout=10)
         if resp.status_code == 429:
             logger.warning(f"IEEE Xplore rate limit (429) for query '{query}'")
-            raise requests.exceptions.HTTPError("429")
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         articles = []
         for item in data.get('articles', []):
-            title = item.get('title', 'No title available')
+            get = item.get
+            title = get('title') or 'No title available'
             if title == 'No title available':
                 logger.warning(f"Skipping IEEE item without title (query: {query})")
                 continue
-            authors_list = item.get('authors', {}).get('authors', [])
-            authors = ', '.join(a.get('full_name', '') for a in authors_list)
-            if len(authors) > 1000:
-                authors = authors[:950] + ' ... et al.'
-            pub_year = item.get('publication_year')
-            date_obj = datetime.strptime(str(pub_year), '%Y').date() if pub_year else None
-            doi = item.get('doi')
-            link = f"https://ieeexplore.ieee.org/document/{item.get('article_number')}" if item.get('article_number') else item.get('html_url', 'https://ieeexplore.ieee.org')
+            authors_list = get('authors', {}).get('authors', [])
+            authors = _fmt_authors(a.get('full_name', '') for a in authors_list)
+            pub_year = get('publication_year')
+            date_obj = date(int(pub_year), 1, 1) if pub_year else None
+            doi = get('doi')
+            article_number = get('article_number')
+            link = f"https://ieeexplore.ieee.org/document/{article_number}" if article_number else get('html_url', 'https://ieeexplore.ieee.org')
             if doi:
                 link = f"https://doi.org/{doi}"
-            full_text = _safe_str(item.get('abstract'))
+            full_text = _safe_str(get('abstract'))
             articles.append({
                 'title': title,
                 'authors': authors,
@@ -356,89 +562,259 @@ def ieee_search(query='6G wireless communication', max_results=30):
         logger.info(f"IEEE Xplore fetched {len(articles)} articles for query '{query}'")
         return articles
     except Exception as e:
+        if _is_transient(e):
+            raise  # handled by http_retry
         logger.error(f"IEEE Xplore error for query '{query}': {e}")
         return []
 # ----------------------------------------------------------------------
 # Improved relevance scoring – partial keyword match + title boost
 # ----------------------------------------------------------------------
+# Each keyword word maps to the keywords containing it; one pattern finds
+# every word in a single pass (lookahead so overlapping hits are kept)
+G6_KEYWORDS_LC = tuple(kw.lower() for kw in G6_KEYWORDS)
+G6_KEYWORD_WORDS = tuple(tuple(kw.split()) for kw in G6_KEYWORDS_LC)
+
+# word -> bitmask of the keywords containing it; one overlapping-match pass
+# over the text (guarded by a first-character class) replaces a scan per keyword
+# Callers lowercase the text first: re.IGNORECASE made these scans ~3x slower
+_KEYWORD_MASKS = {}
+for _i, _words in enumerate(G6_KEYWORD_WORDS):
+    for _w in _words:
+        _KEYWORD_MASKS[_w] = _KEYWORD_MASKS.get(_w, 0) | (1 << _i)
+# The alternation reports only the first alternative that matches at a position, so try
+# longer words first and let each word also carry the masks of the words it starts with
+# ("networks" implies "network" occurs at the same spot)
+_KEYWORD_MASKS = {w: functools.reduce(operator.or_, (m for v, m in _KEYWORD_MASKS.items() if w.startswith(v)))
+                  for w in sorted(_KEYWORD_MASKS, key=len, reverse=True)}
+_ALL_KEYWORDS = (1 << len(G6_KEYWORDS_LC)) - 1
+_FIRST_CHARS = ''.join(sorted({re.escape(w[0]) for w in _KEYWORD_MASKS}))
+_WORD_RE = re.compile(f'(?=[{_FIRST_CHARS}])(?=(' + '|'.join(map(re.escape, _KEYWORD_MASKS)) + '))')
+# Every keyword starts with "6g ": matching that shared prefix literally lets
+# the regex engine jump between candidates instead of trying every position.
+# ("6g " can't overlap itself, so distinct suffixes == distinct phrases)
+_PHRASE_PREFIX = os.path.commonprefix(G6_KEYWORDS_LC)
+# Same longest-first rule as _WORD_RE; each suffix maps to every keyword suffix it starts with
+_PHRASE_SUFFIXES = sorted({kw[len(_PHRASE_PREFIX):] for kw in G6_KEYWORDS_LC}, key=len, reverse=True)
+_PHRASE_COVERS = {suf: frozenset(s for s in _PHRASE_SUFFIXES if suf.startswith(s)) for suf in _PHRASE_SUFFIXES}
+_PHRASE_RE = re.compile(re.escape(_PHRASE_PREFIX) + '(?=('
+                        + '|'.join(map(re.escape, _PHRASE_SUFFIXES)) + '))')
+
+def mentions_keyword(title, full_text):
+    """Cheap pre-check: does the text contain any keyword word at all?"""
+    return _WORD_RE.search(f"{title} {full_text}".lower()) is not None
+
 def calculate_relevance(article):
-    title = article.get('title', '').lower()
-    full_text = article.get('full_text', '').lower()
-    text = title + ' ' + full_text
-
-    # Split each keyword into its words and count any occurrence
-    score = 0
-    for kw in G6_KEYWORDS:
-        kw_words = kw.lower().split()
-        for w in kw_words:
-            if w in text:
-                score += 1
-                break   # count the keyword only once
+    # Every provider stores title/full_text as str, never None
+    return _relevance(article['title'], article['full_text'])
+
+# The same paper comes back for several keywords (and from the backup), so the
+# lowercasing and matching for identical text is done only once per run
+@functools.lru_cache(maxsize=4096)
+def _relevance(title, full_text):
+    title = title.lower()
+    text = title + ' ' + full_text.lower()
+
+    # A keyword counts once if any of its words occurs anywhere
+    matched = 0
+    for m in _WORD_RE.finditer(text):
+        matched |= _KEYWORD_MASKS[m.group(1)]
+        if matched == _ALL_KEYWORDS:
+            break  # every keyword already counted; the rest of the text can't add more
+    if not matched:
+        return 0  # no keyword word anywhere, so no phrase in the title either
+    score = bin(matched).count('1')
 
     # Give a big boost if the keyword appears in the title
-    for kw in G6_KEYWORDS:
-        if kw.lower() in title:
-            score += 3
+    score += 3 * len(frozenset().union(*(_PHRASE_COVERS[m.group(1)] for m in _PHRASE_RE.finditer(title))))
 
     return score
 
+# ----------------------------------------------------------------------
+# Dedup identity – the same paper shows up as arXiv, DOI and publisher links
+# ----------------------------------------------------------------------
+DOI_RE = re.compile(r'10\.\d{4,9}/[^\s"<>]+')
+ARXIV_ID_RE = re.compile(r'arxiv\.org/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$')
+_NON_WORD_RE = re.compile(r'\W+')
+
+TITLE_KEY_LEN = 120
+
+def canonical_keys(article):
+    """Every identity the article can be matched on: DOI, arXiv id, normalized title.
+    Two copies are the same paper if they share any of them – a preprint and its
+    journal version share the title, retitled copies still share the DOI."""
+    link = article.get('link', '')
+    keys = []
+    m = DOI_RE.search(link)
+    if m:
+        keys.append(m.group(0).lower())
+    m = ARXIV_ID_RE.search(link)
+    if m:
+        keys.append('arxiv:' + m.group(1))
+    title = _NON_WORD_RE.sub('', article.get('title', '').lower())[:TITLE_KEY_LEN]
+    if title:
+        keys.append(title)
+    return keys or [link]
+
+# Keys of articles already saved by earlier weekly runs; they are dropped
+# before scoring instead of surviving to the scheduler's DB check
+REPORTED_KEYS_PATH = pathlib.Path("backend/backup/reported_keys.json")
+
+def _load_reported_keys():
+    try:
+        return set(orjson.loads(REPORTED_KEYS_PATH.read_bytes()))
+    except (OSError, ValueError):
+        return set()
+
+def mark_reported(articles):
+    keys = _load_reported_keys()
+    for a in articles:
+        keys.update(canonical_keys(a))
+    REPORTED_KEYS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORTED_KEYS_PATH.write_bytes(orjson.dumps(sorted(keys)))
+
+# ----------------------------------------------------------------------
+# Concurrent fetch – per-host concurrency caps
+# ----------------------------------------------------------------------
+PROVIDERS = [
+    ('arxiv', arxiv_search),
+    ('core', core_search),
+    ('crossref', crossref_search),
+    ('sciencedirect', sciencedirect_search),
+    ('ieee', ieee_search),
+]
+
+# In-flight requests allowed per host; arXiv and Semantic Scholar are the strictest.
+# Each host gets its own pool of that size, so a queue of arXiv calls never
+# ties up threads that the faster hosts could be using
+HOST_WORKERS = {
+    'arxiv': 1,
+    'semantic': 1,
+    'scholar': 1,
+    'core': 2,
+    'crossref': 4,
+    'sciencedirect': 2,
+    'ieee': 2,
+}
+# ~10 per (keyword, provider) still leaves hundreds of unique candidates for the final 50
+PER_PROVIDER_LIMIT = 10
+SCHOLAR_LIMIT = 20
+
+def _load_previous_backup(backup_dir, current, cutoff):
+    """Dated articles published on or after cutoff from the newest backup other than
+    this week's, or [] if none."""
+    # Older weeks may still be plain .json; gzip ones sort right after them
+    previous = sorted(p for p in backup_dir.glob("allresult_week_*.json*")
+                      if p.name.split('.')[0] != current.name.split('.')[0])
+    if not previous:
+        return []
+    try:
+        data = previous[-1].read_bytes()
+        if previous[-1].suffix == '.gz':
+            data = gzip.decompress(data)
+        articles = orjson.loads(data)
+    except (OSError, ValueError, EOFError) as e:
+        logger.warning(f"Could not read previous backup {previous[-1]}: {e}")
+        return []
+    kept = []
+    for a in articles:
+        if not a.get('publish_date'):
+            continue
+        a['publish_date'] = date.fromisoformat(a['publish_date'])
+        if a['publish_date'] < cutoff:
+            continue
+        a.pop('relevance_score', None)  # rescored with the current keywords
+        kept.append(a)
+    logger.info(f"Merged {len(kept)} of {len(articles)} articles from previous backup {previous[-1]}")
+    return kept
+
 # ----------------------------------------------------------------------
 # MAIN weekly search – backup + 180-day recent window
 # ----------------------------------------------------------------------
 def weekly_search():
-    all_articles = []
-    for kw in G6_KEYWORDS:
-        all_articles += arxiv_search(kw, max_results=30)
-        all_articles += semantic_search(kw, max_results=30)
-        all_articles += core_search(kw, max_results=30)
-        all_articles += crossref_search(kw, max_results=30)
-        all_articles += sciencedirect_search(kw, max_results=30)
-        all_articles += ieee_search(kw, max_results=30)
-        time.sleep(5)          # be gentle to all APIs
-
-    all_articles += scholarly_search(G6_KEYWORDS[0], max_results=30)
+    # Fan out every (keyword, provider) request over per-host thread pools;
+    # each provider keeps its own concurrency cap instead of a global sleep
+    with ExitStack() as stack:
+        pools = {name: stack.enter_context(ThreadPoolExecutor(max_workers=n, thread_name_prefix=name))
+                 for name, n in HOST_WORKERS.items()}
+        # Scholar is slow and paced per result; it runs alongside the API fetches
+        scholar_future = None
+        if ENABLE_SCHOLAR:
+            scholar_future = pools['scholar'].submit(scholarly_search, G6_KEYWORDS[0],
+                                                     max_results=SCHOLAR_LIMIT)
+        # Semantic Scholar takes every keyword in one call (bulk endpoint)
+        futures = [pools['semantic'].submit(semantic_search, tuple(G6_KEYWORDS))]
+        providers = [(name, fn) for name, fn in PROVIDERS if name not in SKIP_SOURCES]
+        futures += [pools[name].submit(fn, kw, max_results=PER_PROVIDER_LIMIT)
+                    for kw in G6_KEYWORDS for name, fn in providers]
+        # Score each batch as soon as it arrives so scoring overlaps the
+        # requests still in flight
+        for future in as_completed(futures):
+            for a in future.result():
+                a['relevance_score'] = calculate_relevance(a)
+        # Merge in submission order so dedup stays deterministic
+        all_articles = []
+        for future in futures:
+            all_articles += future.result()
+        if scholar_future:
+            all_articles += scholar_future.result()
+
+    # Providers only return the last FETCH_WINDOW_DAYS; carry earlier finds forward
+    backup_dir = pathlib.Path("backend/backup")
+    now = datetime.now()
+    week_num = now.isocalendar()[1]
+    backup_path = backup_dir / f"allresult_week_{now.year}-{week_num:02d}.json.gz"
+    recent_cutoff = (now - timedelta(days=365)).date()
+    all_articles += _load_previous_backup(backup_dir, backup_path, recent_cutoff)
 
     # -------------------------------------------------
     # Deduplicate
     # -------------------------------------------------
-    seen = set()
-    unique = []
+    # One entry per paper (matched on DOI, arXiv id or title); keep the best-scored
+    # copy, with its score stored next to it so comparisons skip the dict lookups
+    reported = _load_reported_keys()
+    best = []   # (score, article), one slot per paper
+    slot = {}   # identity (DOI, arXiv id or title) -> index into best
     for a in all_articles:
-        key = (a.get('title', ''), a.get('link', ''))
-        if key not in seen:
-            seen.add(key)
-            a['relevance_score'] = calculate_relevance(a)
-            unique.append(a)
+        keys = canonical_keys(a)
+        if not reported.isdisjoint(keys):
+            continue
+        score = a.get('relevance_score')
+        if score is None:
+            score = a['relevance_score'] = calculate_relevance(a)
+        i = next((slot[k] for k in keys if k in slot), None)
+        if i is None:
+            i = len(best)
+            best.append((score, a))
+        elif score > best[i][0]:
+            best[i] = (score, a)
+        for k in keys:
+            slot.setdefault(k, i)
+    unique = [a for _, a in best]
 
     # -------------------------------------------------
-    # BACKUP – all unique articles
+    # Filter for recent papers – 365 days
     # -------------------------------------------------
-    backup_dir = pathlib.Path("backend/backup")
-    backup_dir.mkdir(parents=True, exist_ok=True)
-
-    now = datetime.now()
-    week_num = now.isocalendar()[1]
-    backup_path = backup_dir / f"allresult_week_{now.year}-{week_num:02d}.json"
-
-    with open(backup_path, "w", encoding="utf-8") as f:
-        json.dump(unique, f, indent=2, default=str)
-    logger.info(f"BACKUP: {len(unique)} unique articles saved to {backup_path}")
+    # Partition in one pass; undated articles are dropped
+    recent, older = [], []
+    for a in unique:
+        published = a.get('publish_date')
+        if published:
+            (recent if published >= recent_cutoff else older).append(a)
 
     # -------------------------------------------------
-    # Filter for recent papers – 365 days
+    # BACKUP – unique articles inside the 365-day window
     # -------------------------------------------------
-    recent_cutoff = now - timedelta(days=365)
-    recent = [a for a in unique
-              if a.get('publish_date') and a['publish_date'] >= recent_cutoff.date()]
+    # Only these are worth carrying into next week; the rest would just be rescored forever
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    # Compact + gzip level 3: a fraction of the indented size for next to no CPU
+    backup_path.write_bytes(gzip.compress(orjson.dumps(recent, default=str), compresslevel=3))
+    logger.info(f"BACKUP: {len(recent)} of {len(unique)} unique articles saved to {backup_path}")
 
-    # If we have fewer than 50 recent, fill with highest-scored older ones
+    # Best 50 recent papers, best first (the scheduler takes them in this order);
+    # if there are fewer than 50, fill with the highest-scored older ones
+    recent = heapq.nlargest(50, recent, key=lambda x: x['relevance_score'])
     if len(recent) < 50:
-        older = [a for a in unique
-                 if a.get('publish_date') and a['publish_date'] < recent_cutoff.date()]
-        older.sort(key=lambda x: x['relevance_score'], reverse=True)
-        recent += older[:50 - len(recent)]
-    else:
-        recent = recent[:50]
+        recent += heapq.nlargest(50 - len(recent), older, key=lambda x: x['relevance_score'])
 
     recent = unpaywall_enrich(recent)
 
@@ -1,6 +1,10 @@
-import json
+import orjson
+import hashlib
 import logging
+import os
+import pathlib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from ollama import Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -9,6 +13,28 @@ logger = logging.getLogger(__name__)
 
 client = Client(host='http://127.0.0.1:11434')
 
+# Built once; each call only splices the text in between
+_PROMPT_PREFIX = (
+    "Summarize the following text in 200-250 characters, providing a detailed explanation of the article's content, key findings, or contributions. "
+    "Avoid repeating the title or creating a vague summary. "
+    "Return only a JSON object with 'summary' and 'key_points' fields (3-5 key points, brief and relevant). "
+    "Text: "
+)
+_PROMPT_SUFFIX = (
+    "\n\n"
+    "Example:\n"
+    '{"summary": "This article explores D-band (110-170 GHz) for 6G, highlighting high bandwidths and low absorption. It reviews hardware integration and outlines challenges and solutions for 6G systems.", '
+    '"key_points": ["High bandwidth in D-band", "Low atmospheric absorption", "Hardware integration challenges"]}'
+)
+_JSON_RE = re.compile(r'\{.*?\}', re.DOTALL)
+
+# Ollama only generates OLLAMA_NUM_PARALLEL requests at once; more workers just queue
+SUMMARY_WORKERS = int(os.getenv('OLLAMA_NUM_PARALLEL', '8'))
+
+SUMMARY_MODEL = 'llama3.2'
+# Successful summaries keyed by sha256(model + prompt text); re-runs skip Ollama
+SUMMARY_CACHE_DIR = pathlib.Path("backend/backup/cache/summaries")
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10), retry=retry_if_exception_type(Exception))
 def generate_summary(text):
     """
@@ -19,19 +45,18 @@ def generate_summary(text):
         logger.warning("Input text is too short or empty, returning default response")
         return {"summary": "No valid text provided for summarization.", "key_points": []}
 
-    prompt = (
-        "Summarize the following text in 200-250 characters, providing a detailed explanation of the article's content, key findings, or contributions. "
-        "Avoid repeating the title or creating a vague summary. "
-        "Return only a JSON object with 'summary' and 'key_points' fields (3-5 key points, brief and relevant). "
-        f"Text: {text[:10000]}\n\n"
-        "Example:\n"
-        '{"summary": "This article explores D-band (110-170 GHz) for 6G, highlighting high bandwidths and low absorption. It reviews hardware integration and outlines challenges and solutions for 6G systems.", '
-        '"key_points": ["High bandwidth in D-band", "Low atmospheric absorption", "Hardware integration challenges"]}'
-    )
+    key = hashlib.sha256(f"{SUMMARY_MODEL}:{text[:10000]}".encode('utf-8')).hexdigest()
+    cache_path = SUMMARY_CACHE_DIR / f"{key}.json"
+    try:
+        return orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        pass
+
+    prompt = _PROMPT_PREFIX + text[:10000] + _PROMPT_SUFFIX
 
     try:
         response = client.chat(
-            model='llama3.2',
+            model=SUMMARY_MODEL,
             messages=[{'role': 'user', 'content': prompt}],
             options={'temperature': 0.5, 'max_tokens': 500}
         )
@@ -39,13 +64,13 @@ def generate_summary(text):
         logger.info(f"Ollama raw response: {response_text}")
 
         # Extract JSON using regex
-        json_match = re.search(r'\{.*?\}', response_text, re.DOTALL)
+        json_match = _JSON_RE.search(response_text)
         if not json_match:
             logger.error(f"No valid JSON found in response: {response_text}")
             return {"summary": "Error generating summary.", "key_points": []}
 
         json_text = json_match.group(0)
-        result = json.loads(json_text)
+        result = orjson.loads(json_text)
         summary = result.get('summary', '')
         key_points = result.get('key_points', [])
 
@@ -62,10 +87,36 @@ def generate_summary(text):
             key_points.extend(["Generic point"] * (3 - len(key_points)))
 
         logger.info(f"Generated summary: {summary[:100]}... Key points: {key_points}")
-        return {"summary": summary, "key_points": key_points[:5]}
-    except json.JSONDecodeError as e:
+        result = {"summary": summary, "key_points": key_points[:5]}
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON: {e}, JSON text: {json_text}")
         return {"summary": "Error generating summary.", "key_points": []}
     except Exception as e:
         logger.error(f"Ollama error: {e}, Response: {response_text}")
         return {"summary": "Error generating summary.", "key_points": []}
+
+    # A cache write failure must not throw away a good summary
+    try:
+        SUMMARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(orjson.dumps(result))
+    except OSError as e:
+        logger.warning(f"Could not cache summary at {cache_path}: {e}")
+    return result
+
+def summarize_all(articles, max_workers=SUMMARY_WORKERS):
+    """
+    Run generate_summary for every article's full_text concurrently.
+    Returns summaries in the same order as articles; None where a call raised.
+    """
+    if not articles:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(articles))) as pool:
+        futures = [pool.submit(generate_summary, a['full_text']) for a in articles]
+        summaries = []
+        for article, future in zip(articles, futures):
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                logger.error(f"Summary failed for {article['title'][:60]}: {e}")
+                summaries.append(None)
+    return summaries
@@ -2,7 +2,7 @@ import feedparser
 import urllib.parse
 
 query = '6G wireless communication'
-broad_query = f'6G OR {urllib.parse.quote(query)}'
+broad_query = f'6G OR {query}'  # urlencode below does the escaping
 params = {
     'search_query': broad_query,
     'start': '0',
@@ -1,97 +1,251 @@
-from flask import Flask, render_template, request, send_from_directory, send_file, abort, make_response, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, send_from_directory, send_file, abort, make_response, jsonify, session, redirect, url_for, g
 from datetime import datetime
-import json
+import atexit
+import orjson
 import os
 import glob
+import heapq
 import logging
-from functools import wraps  # Added for wraps in decorator
+import mimetypes
+import threading
+import time
+import uuid
+from urllib.parse import quote
+from functools import lru_cache, wraps  # Added for wraps in decorator
 from backend.models import Article, WebsiteView, VideoPlay, PodcastPlay, ArticleClick, Like
 from backend.db import session as db_session
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.utils import safe_join
+from sqlalchemy import delete, func, literal, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.secret_key = 'your_super_secret_key_change_me'  # Change this to a secure random value in production
+# Compiled templates survive restarts and are shared by workers (per-user temp dir by default)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.getenv('JINJA_CACHE_DIR'))
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Let the web server stream media instead of a worker thread: USE_X_SENDFILE=1 for Apache/lighttpd,
+# or MEDIA_ACCEL_PREFIX=/_media for an nginx `internal` location whose alias is BASE_DIR
+app.use_x_sendfile = os.getenv('USE_X_SENDFILE') == '1'
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '').rstrip('/')
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    # Hand the thread's connection back to the pool and drop any failed transaction
+    db_session.remove()
+
+@app.before_request
+def load_user_session_id():
+    # Stable per-browser id for likes; issued once and kept in the session cookie
+    g.user_session_id = session.setdefault('user_id', uuid.uuid4().hex)
+
+# Site-wide view counter, read by every page; (expires, count or None if no row yet)
+TOTAL_VIEWS_TTL = 30
+_total_views = (0.0, None)
+
+def get_total_views(default=0):
+    global _total_views
+    expires, count = _total_views
+    if expires <= time.monotonic():
+        count = db_session.query(WebsiteView.view_count).order_by(WebsiteView.id).limit(1).scalar()
+        _total_views = (time.monotonic() + TOTAL_VIEWS_TTL, count)
+    return (default if count is None else count) + _pending_views
+
+# New sessions are counted in memory; a background thread per worker process writes
+# them to the DB every VIEW_FLUSH_INTERVAL seconds
+VIEW_FLUSH_INTERVAL = 5
+_pending_views = 0
+_views_lock = threading.Lock()
+_view_flusher_pid = None
+
+def flush_website_views():
+    global _pending_views, _total_views
+    with _views_lock:
+        delta, _pending_views = _pending_views, 0
+    if not delta:
+        return
+    try:
+        # Single atomic increment, so concurrent workers never overwrite each other's counts
+        first_id = db_session.query(func.min(WebsiteView.id)).scalar_subquery()
+        count = db_session.execute(
+            update(WebsiteView)
+            .where(WebsiteView.id == first_id)
+            .values(view_count=WebsiteView.view_count + delta, last_updated=datetime.utcnow())
+            .returning(WebsiteView.view_count)
+        ).scalar()
+        if count is None:
+            db_session.add(WebsiteView(view_count=delta))
+            count = delta
+        db_session.commit()
+    except Exception as e:
+        db_session.rollback()
+        with _views_lock:
+            _pending_views += delta  # Retry with the next flush
+        logger.error(f"Failed to flush {delta} website views: {e}")
+        return
+    _total_views = (time.monotonic() + TOTAL_VIEWS_TTL, count)
+
+atexit.register(flush_website_views)
+
+def _flush_website_views_forever():
+    while True:
+        time.sleep(VIEW_FLUSH_INTERVAL)
+        if _pending_views:
+            flush_website_views()
+            db_session.remove()  # This thread's own scoped session
+
+def _start_view_flusher():
+    # Started lazily and per pid, so each forked gunicorn worker gets its own thread
+    global _view_flusher_pid
+    with _views_lock:
+        if _view_flusher_pid == os.getpid():
+            return
+        _view_flusher_pid = os.getpid()
+    threading.Thread(target=_flush_website_views_forever, name='view-flusher', daemon=True).start()
+
 def increment_website_view(func):
     @wraps(func)  # Preserve original function name to avoid overwriting endpoint
     def wrapper(*args, **kwargs):
+        global _pending_views
         if 'website_viewed' not in session:
-            view = db_session.query(WebsiteView).first()
-            if not view:
-                view = WebsiteView(view_count=1)
-                db_session.add(view)
-            else:
-                view.view_count += 1
-            db_session.commit()
             session['website_viewed'] = True
+            with _views_lock:
+                _pending_views += 1
+            if _view_flusher_pid != os.getpid():
+                _start_view_flusher()
         return func(*args, **kwargs)
     return wrapper
 
+@lru_cache(maxsize=64)
+def _load_json_cached(path, mtime_ns):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+@lru_cache(maxsize=16)
+def _search_texts(path, mtime_ns):
+    # Lowercased title + authors per item, built once per file version for the article search
+    return tuple(f"{item.get('title') or ''}\0{item.get('authors') or ''}".lower()
+                 for item in _load_json_cached(path, mtime_ns))
+
+def load_json(path, search_term=''):
+    """Parsed JSON list from path ([] if missing); the file is only re-read when its mtime changes.
+    With a lowercase search_term, only items whose title or authors contain it are returned."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    items = _load_json_cached(path, mtime_ns)
+    if search_term:
+        items = [item for item, text in zip(items, _search_texts(path, mtime_ns)) if search_term in text]
+    # Views add per-request fields (likes, play_count...) to each item, so hand out copies
+    return [dict(item) for item in items]
+
+def get_like_stats(keys, user_session_id):
+    """Like totals and the current user's likes for (item_type, item_id) keys.
+    One grouped query in total instead of a count + lookup per item."""
+    if not keys:
+        return {}, set()
+    counts, liked = {}, set()
+    rows = (db_session.query(Like.item_type, Like.item_id, func.count(),
+                             func.count().filter(Like.user_session == user_session_id))
+            .filter(tuple_(Like.item_type, Like.item_id).in_(keys))
+            .group_by(Like.item_type, Like.item_id))
+    for item_type, item_id, total, mine in rows:
+        counts[item_type, item_id] = total
+        if mine:
+            liked.add((item_type, item_id))
+    return counts, liked
+
+def get_video_plays(videos):
+    ids = [v['id'] for v in videos]
+    return dict(db_session.query(VideoPlay.video_id, VideoPlay.play_count).filter(VideoPlay.video_id.in_(ids)))
+
+def get_podcast_plays(podcasts):
+    ids = [p['id'] for p in podcasts]
+    return dict(db_session.query(PodcastPlay.podcast_id, PodcastPlay.play_count).filter(PodcastPlay.podcast_id.in_(ids)))
+
+def get_article_clicks(articles):
+    titles = [a['title'] for a in articles]
+    return dict(db_session.query(ArticleClick.article_title, ArticleClick.click_count).filter(ArticleClick.article_title.in_(titles)))
+
+def get_dashboard_counts(videos, podcasts, articles):
+    """Video plays, podcast plays and article clicks for the dashboard in one UNION ALL round-trip."""
+    stmt = union_all(
+        select(literal('video'), VideoPlay.video_id, VideoPlay.play_count)
+        .where(VideoPlay.video_id.in_([v['id'] for v in videos])),
+        select(literal('podcast'), PodcastPlay.podcast_id, PodcastPlay.play_count)
+        .where(PodcastPlay.podcast_id.in_([p['id'] for p in podcasts])),
+        select(literal('article'), ArticleClick.article_title, ArticleClick.click_count)
+        .where(ArticleClick.article_title.in_([a['title'] for a in articles])),
+    )
+    counts = {'video': {}, 'podcast': {}, 'article': {}}
+    for item_type, item_id, n in db_session.execute(stmt):
+        counts[item_type][item_id] = n
+    return counts['video'], counts['podcast'], counts['article']
+
+def add_item_stats(items, item_type, id_field, count_field, counts, likes, liked):
+    """Set count_field, likes and user_liked on each item in a single pass."""
+    for item in items:
+        item_id = item[id_field]
+        key = (item_type, item_id)
+        item[count_field] = counts.get(item_id, 0)
+        item['likes'] = likes.get(key, 0)
+        item['user_liked'] = key in liked
+
+def render_conditional(template, **context):
+    """Render with an ETag so a revalidating browser gets a 304 when the page hasn't changed.
+    Pages carry per-user like state and live counts, so the body hash is the only safe validator."""
+    response = make_response(render_template(template, **context))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
+
 @app.route('/')
 @increment_website_view
 def dashboard():
     # Load videos from main JSON
-    videos = []
     videos_file = os.path.join(BASE_DIR, 'videos/main/videos.json')
-    if os.path.exists(videos_file):
-        with open(videos_file, 'r') as f:
-            videos = json.load(f)
+    videos = load_json(videos_file)
 
     # Load podcasts from main JSON
-    podcasts = []
     podcasts_file = os.path.join(BASE_DIR, 'podcasts/main/podcasts.json')
-    if os.path.exists(podcasts_file):
-        with open(podcasts_file, 'r') as f:
-            podcasts = json.load(f)
+    podcasts = load_json(podcasts_file)
 
     # Load latest week's articles
     week = request.args.get('week', get_latest_week('backend'))
     json_file = os.path.join(BASE_DIR, f"backend/articles_week_{week}.json")
-    articles = []
-    if os.path.exists(json_file):
-        with open(json_file, 'r') as f:
-            articles = json.load(f)
-            articles = sorted(articles, key=lambda x: x.get('created_at', ''), reverse=True)[:4]  # 4 articles for grid
+    articles = load_json(json_file)
+    articles = heapq.nlargest(4, articles, key=lambda x: x.get('created_at', ''))  # 4 articles for grid
     logger.info(f"Loaded {len(articles)} articles for week {week}")
 
     # Fetch global views
-    website_view = db_session.query(WebsiteView).first()
-    total_views = website_view.view_count if website_view else 0
+    total_views = get_total_views()
 
-    # Fetch play counts
-    video_plays = {vp.video_id: vp.play_count for vp in db_session.query(VideoPlay).all()}
-    podcast_plays = {pp.podcast_id: pp.play_count for pp in db_session.query(PodcastPlay).all()}
-    article_clicks = {ac.article_title: ac.click_count for ac in db_session.query(ArticleClick).all()}
+    # Fetch play counts – only the rows for items on this page, in one query
+    video_plays, podcast_plays, article_clicks = get_dashboard_counts(videos, podcasts, articles)
 
-    # User session for likes
-    user_session_id = session.get('user_id', request.remote_addr)
-    if 'user_id' not in session:
-        session['user_id'] = user_session_id
+    # Likes for every item on the page in one query
+    likes, liked = get_like_stats(
+        [('video', v['id']) for v in videos]
+        + [('podcast', p['id']) for p in podcasts]
+        + [('article', a['title']) for a in articles],
+        g.user_session_id)
 
     # Add data to videos
-    for video in videos:
-        video['play_count'] = video_plays.get(video['id'], 0)
-        video['likes'] = db_session.query(Like).filter_by(item_type='video', item_id=video['id']).count()
-        video['user_liked'] = db_session.query(Like).filter_by(item_type='video', item_id=video['id'], user_session=user_session_id).first() is not None
+    add_item_stats(videos, 'video', 'id', 'play_count', video_plays, likes, liked)
 
     # Add data to podcasts
-    for podcast in podcasts:
-        podcast['play_count'] = podcast_plays.get(podcast['id'], 0)
-        podcast['likes'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast['id']).count()
-        podcast['user_liked'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast['id'], user_session=user_session_id).first() is not None
+    add_item_stats(podcasts, 'podcast', 'id', 'play_count', podcast_plays, likes, liked)
 
     # Add data to articles
-    for article in articles:
-        title = article['title']
-        article['click_count'] = article_clicks.get(title, 0)
-        article['likes'] = db_session.query(Like).filter_by(item_type='article', item_id=title).count()
-        article['user_liked'] = db_session.query(Like).filter_by(item_type='article', item_id=title, user_session=user_session_id).first() is not None
+    add_item_stats(articles, 'article', 'title', 'click_count', article_clicks, likes, liked)
 
-    return render_template('dashboard.html', videos=videos, podcasts=podcasts, articles=articles, selected_week=week, video_week='main', podcast_week='main', total_views=total_views)
+    return render_conditional('dashboard.html', videos=videos, podcasts=podcasts, articles=articles, selected_week=week, video_week='main', podcast_week='main', total_views=total_views)
 
 @app.route('/videos')
 @increment_website_view
@@ -99,31 +253,22 @@ def videos():
     week = request.args.get('week', get_latest_week('videos'))
     videos_file = os.path.join(BASE_DIR, f"videos/{week}/videos.json")
     media_week = week
-    videos = []
-    if os.path.exists(videos_file):
-        with open(videos_file, 'r') as f:
-            videos = json.load(f)
+    videos = load_json(videos_file)
     # Fallback to main
     if not videos:
         media_week = 'main'
         videos_file = os.path.join(BASE_DIR, 'videos/main/videos.json')
-        if os.path.exists(videos_file):
-            with open(videos_file, 'r') as f:
-                videos = json.load(f)
+        videos = load_json(videos_file)
     logger.info(f"Loaded {len(videos)} videos for week {week}")
     weeks = get_weeks_from_folder('videos')
-    weeks.sort(reverse=True)
 
     # Add play counts and likes
-    video_plays = {vp.video_id: vp.play_count for vp in db_session.query(VideoPlay).all()}
-    user_session_id = session.get('user_id', request.remote_addr)
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 0
-    for video in videos:
-        video['play_count'] = video_plays.get(video['id'], 0)
-        video['likes'] = db_session.query(Like).filter_by(item_type='video', item_id=video['id']).count()
-        video['user_liked'] = db_session.query(Like).filter_by(item_type='video', item_id=video['id'], user_session=user_session_id).first() is not None
+    video_plays = get_video_plays(videos)
+    total_views = get_total_views()
+    likes, liked = get_like_stats([('video', v['id']) for v in videos], g.user_session_id)
+    add_item_stats(videos, 'video', 'id', 'play_count', video_plays, likes, liked)
 
-    return render_template('videos.html', videos=videos, selected_week=week, weeks=weeks, media_week=media_week, total_views=total_views)
+    return render_conditional('videos.html', videos=videos, selected_week=week, weeks=weeks, media_week=media_week, total_views=total_views)
 
 @app.route('/podcasts')
 @increment_website_view
@@ -131,31 +276,22 @@ def podcasts():
     week = request.args.get('week', get_latest_week('podcasts'))
     podcasts_file = os.path.join(BASE_DIR, f"podcasts/{week}/podcasts.json")
     media_week = week
-    podcasts = []
-    if os.path.exists(podcasts_file):
-        with open(podcasts_file, 'r') as f:
-            podcasts = json.load(f)
+    podcasts = load_json(podcasts_file)
     # Fallback to main
     if not podcasts:
         media_week = 'main'
         podcasts_file = os.path.join(BASE_DIR, 'podcasts/main/podcasts.json')
-        if os.path.exists(podcasts_file):
-            with open(podcasts_file, 'r') as f:
-                podcasts = json.load(f)
+        podcasts = load_json(podcasts_file)
     logger.info(f"Loaded {len(podcasts)} podcasts for week {week}")
     weeks = get_weeks_from_folder('podcasts')
-    weeks.sort(reverse=True)
 
     # Add play counts and likes
-    podcast_plays = {pp.podcast_id: pp.play_count for pp in db_session.query(PodcastPlay).all()}
-    user_session_id = session.get('user_id', request.remote_addr)
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 0
-    for podcast in podcasts:
-        podcast['play_count'] = podcast_plays.get(podcast['id'], 0)
-        podcast['likes'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast['id']).count()
-        podcast['user_liked'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast['id'], user_session=user_session_id).first() is not None
+    podcast_plays = get_podcast_plays(podcasts)
+    total_views = get_total_views()
+    likes, liked = get_like_stats([('podcast', p['id']) for p in podcasts], g.user_session_id)
+    add_item_stats(podcasts, 'podcast', 'id', 'play_count', podcast_plays, likes, liked)
 
-    return render_template('podcasts.html', podcasts=podcasts, selected_week=week, weeks=weeks, media_week=media_week, total_views=total_views)
+    return render_conditional('podcasts.html', podcasts=podcasts, selected_week=week, weeks=weeks, media_week=media_week, total_views=total_views)
 
 @app.route('/articles')
 @increment_website_view
@@ -163,33 +299,23 @@ def articles():
     week = request.args.get('week', get_latest_week('backend'))
     search_term = request.args.get('search', '').lower()
     json_file = os.path.join(BASE_DIR, f"backend/articles_week_{week}.json")
-    articles = []
-    if os.path.exists(json_file):
-        with open(json_file, 'r') as f:
-            articles = json.load(f)
-            articles = sorted(articles, key=lambda x: x.get('created_at', ''), reverse=True)
-            if search_term:
-                articles = [a for a in articles if search_term in a.get('title', '').lower() or search_term in a.get('authors', '').lower()]
+    articles = load_json(json_file, search_term)
+    articles.sort(key=lambda x: x.get('created_at', ''), reverse=True)
     logger.info(f"Loaded {len(articles)} articles for week {week}, search '{search_term}'")
-    weeks = [file.split('articles_week_')[-1].replace('.json', '') for file in glob.glob(os.path.join(BASE_DIR, 'backend/articles_week_*.json'))]
-    weeks.sort(reverse=True)
+    weeks = get_weeks_from_folder('backend')
 
     # Add click counts and likes
-    article_clicks = {ac.article_title: ac.click_count for ac in db_session.query(ArticleClick).all()}
-    user_session_id = session.get('user_id', request.remote_addr)
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 0
-    for article in articles:
-        title = article['title']
-        article['click_count'] = article_clicks.get(title, 0)
-        article['likes'] = db_session.query(Like).filter_by(item_type='article', item_id=title).count()
-        article['user_liked'] = db_session.query(Like).filter_by(item_type='article', item_id=title, user_session=user_session_id).first() is not None
+    article_clicks = get_article_clicks(articles)
+    total_views = get_total_views()
+    likes, liked = get_like_stats([('article', a['title']) for a in articles], g.user_session_id)
+    add_item_stats(articles, 'article', 'title', 'click_count', article_clicks, likes, liked)
 
-    return render_template('articles.html', articles=articles, selected_week=week, weeks=weeks, search_term=search_term, total_views=total_views)
+    return render_conditional('articles.html', articles=articles, selected_week=week, weeks=weeks, search_term=search_term, total_views=total_views)
 
 @app.route('/about')
 @increment_website_view
 def about():
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 3
+    total_views = get_total_views(default=3)
     return render_template('about.html', total_views=total_views)
 
 @app.route('/videos/<week>/<video_id>')
@@ -201,29 +327,21 @@ def video_detail(week, video_id):
 
     videos_file = os.path.join(BASE_DIR, f"videos/{week}/videos.json")
     media_week = week
-    videos = []
-    if os.path.exists(videos_file):
-        with open(videos_file, 'r') as f:
-            videos = json.load(f)
+    videos = load_json(videos_file)
     # Fallback to main
     if not videos:
         media_week = 'main'
         videos_file = os.path.join(BASE_DIR, 'videos/main/videos.json')
-        if os.path.exists(videos_file):
-            with open(videos_file, 'r') as f:
-                videos = json.load(f)
+        videos = load_json(videos_file)
     video = next((v for v in videos if v['id'] == video_id), None)
     if not video:
         abort(404)
     other_videos = [v for v in videos if v['id'] != video_id]
 
     # Add play count and likes
-    play = db_session.query(VideoPlay).filter_by(video_id=video_id).first()
-    video['play_count'] = play.play_count if play else 0
-    user_session_id = session.get('user_id', request.remote_addr)
-    video['likes'] = db_session.query(Like).filter_by(item_type='video', item_id=video_id).count()
-    video['user_liked'] = db_session.query(Like).filter_by(item_type='video', item_id=video_id, user_session=user_session_id).first() is not None
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 0
+    likes, liked = get_like_stats([('video', video_id)], g.user_session_id)
+    add_item_stats([video], 'video', 'id', 'play_count', get_video_plays([video]), likes, liked)
+    total_views = get_total_views()
 
     return render_template('video_detail.html', video=video, selected_week=week, other_videos=other_videos, media_week=media_week, total_views=total_views)
 
@@ -236,39 +354,44 @@ def podcast_detail(week, podcast_id):
 
     podcasts_file = os.path.join(BASE_DIR, f"podcasts/{week}/podcasts.json")
     media_week = week
-    podcasts = []
-    if os.path.exists(podcasts_file):
-        with open(podcasts_file, 'r') as f:
-            podcasts = json.load(f)
+    podcasts = load_json(podcasts_file)
     # Fallback to main
     if not podcasts:
         media_week = 'main'
         podcasts_file = os.path.join(BASE_DIR, 'podcasts/main/podcasts.json')
-        if os.path.exists(podcasts_file):
-            with open(podcasts_file, 'r') as f:
-                podcasts = json.load(f)
+        podcasts = load_json(podcasts_file)
     podcast = next((p for p in podcasts if p['id'] == podcast_id), None)
     if not podcast:
         abort(404)
     other_podcasts = [p for p in podcasts if p['id'] != podcast_id]
 
     # Add play count and likes
-    play = db_session.query(PodcastPlay).filter_by(podcast_id=podcast_id).first()
-    podcast['play_count'] = play.play_count if play else 0
-    user_session_id = session.get('user_id', request.remote_addr)
-    podcast['likes'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast_id).count()
-    podcast['user_liked'] = db_session.query(Like).filter_by(item_type='podcast', item_id=podcast_id, user_session=user_session_id).first() is not None
-    total_views = db_session.query(WebsiteView).first().view_count if db_session.query(WebsiteView).first() else 0
+    likes, liked = get_like_stats([('podcast', podcast_id)], g.user_session_id)
+    add_item_stats([podcast], 'podcast', 'id', 'play_count', get_podcast_plays([podcast]), likes, liked)
+    total_views = get_total_views()
 
     return render_template('podcast_detail.html', podcast=podcast, selected_week=week, other_podcasts=other_podcasts, media_week=media_week, total_views=total_views)
 
+def send_media(folder, week, filename):
+    """Media file response; handed off to the front proxy when it is configured to serve it."""
+    if not MEDIA_ACCEL_PREFIX:
+        return send_from_directory(os.path.join(BASE_DIR, folder, week), filename)
+    path = safe_join(os.path.join(BASE_DIR, folder), week, filename)
+    if path is None or not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    # nginx keeps our Content-Type and streams the file itself from its internal location
+    response = make_response('')
+    response.headers['X-Accel-Redirect'] = quote(f"{MEDIA_ACCEL_PREFIX}/{folder}/{week}/{filename}")
+    response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    return response
+
 @app.route('/videos/<week>/<path:filename>')
 def serve_video_file(week, filename):
     directory = os.path.join(BASE_DIR, 'videos', week)
     if not os.path.exists(directory):
         abort(404)
     try:
-        return send_from_directory(directory, filename)
+        return send_media('videos', week, filename)
     except FileNotFoundError:
         logger.error(f"Video file not found: {directory}/{filename}")
         abort(404)
@@ -279,7 +402,7 @@ def serve_podcast_file(week, filename):
     if not os.path.exists(directory):
         abort(404)
     try:
-        return send_from_directory(directory, filename)
+        return send_media('podcasts', week, filename)
     except FileNotFoundError:
         logger.error(f"Podcast file not found: {directory}/{filename}")
         abort(404)
@@ -291,63 +414,77 @@ def increment_play():
     item_id = data['id']
     Model = VideoPlay if item_type == 'video' else PodcastPlay
     attr = 'video_id' if item_type == 'video' else 'podcast_id'
-    play = db_session.query(Model).filter_by(**{attr: item_id}).first()
-    if not play:
-        play = Model(**{attr: item_id, 'play_count': 1})
-        db_session.add(play)
-    else:
-        play.play_count += 1
+    # One round-trip, and concurrent first plays can't collide on the unique id
+    stmt = (
+        pg_insert(Model)
+        .values(**{attr: item_id, 'play_count': 1})
+        .on_conflict_do_update(index_elements=[attr], set_={'play_count': Model.play_count + 1})
+        .returning(Model.play_count)
+    )
+    count = db_session.execute(stmt).scalar()
     db_session.commit()
-    return jsonify({'count': play.play_count})
+    return jsonify({'count': count})
 
 @app.route('/api/increment_article_click', methods=['POST'])
 def increment_article_click():
     data = request.json
     title = data['title']
-    click = db_session.query(ArticleClick).filter_by 
-    if not click:
-        click = ArticleClick(article_title=title, click_count=1)
-        db_session.add(click)
-    else:
-        click.click_count += 1
+    stmt = (
+        pg_insert(ArticleClick)
+        .values(article_title=title, click_count=1)
+        .on_conflict_do_update(index_elements=['article_title'], set_={'click_count': ArticleClick.click_count + 1})
+        .returning(ArticleClick.click_count)
+    )
+    count = db_session.execute(stmt).scalar()
     db_session.commit()
-    return jsonify({'count': click.click_count})
+    return jsonify({'count': count})
 
 @app.route('/api/toggle_like', methods=['POST'])
 def toggle_like():
     data = request.json
     item_type = data['type']
     item_id = data['id']
-    user_session_id = session.get('user_id', request.remote_addr)
-    like = db_session.query(Like).filter_by(item_type=item_type, item_id=item_id, user_session=user_session_id).first()
-    if like:
-        db_session.delete(like)
+    # Delete first; if there was nothing to delete, this is a like
+    unliked = db_session.execute(
+        delete(Like)
+        .where(Like.item_type == item_type, Like.item_id == item_id, Like.user_session == g.user_session_id)
+        .returning(Like.id)
+    ).first()
+    if unliked:
         liked = False
     else:
-        like = Like(item_type=item_type, item_id=item_id, user_session=user_session_id)
-        db_session.add(like)
+        db_session.execute(
+            pg_insert(Like)
+            .values(item_type=item_type, item_id=item_id, user_session=g.user_session_id)
+            .on_conflict_do_nothing(constraint='unique_like')
+        )
         liked = True
     db_session.commit()
-    total = db_session.query(Like).filter_by(item_type=item_type, item_id=item_id).count()
+    total = db_session.query(func.count(Like.id)).filter_by(item_type=item_type, item_id=item_id).scalar()
     return jsonify({'liked': liked, 'total': total})
 
 def get_latest_week(folder='backend'):
-    if folder == 'backend':
-        weeks = [file.split('articles_week_')[-1].replace('.json', '') for file in glob.glob(os.path.join(BASE_DIR, f'{folder}/articles_week_*.json'))]
-    else:
-        weeks = get_weeks_from_folder(folder)
+    weeks = get_weeks_from_folder(folder)
     if weeks:
-        weeks.sort(reverse=True)
         return weeks[0]
     return get_current_week()
 
-def get_weeks_from_folder(folder):
-    weeks = []
+@lru_cache(maxsize=8)
+def _list_weeks(folder, mtime_ns):
     folder_path = os.path.join(BASE_DIR, folder)
-    for dir_name in os.listdir(folder_path):
-        if dir_name.startswith('20') and '-' in dir_name:
-            weeks.append(dir_name)
-    return weeks
+    if folder == 'backend':
+        weeks = [file.split('articles_week_')[-1].replace('.json', '') for file in glob.glob(os.path.join(folder_path, 'articles_week_*.json'))]
+    else:
+        weeks = [dir_name for dir_name in os.listdir(folder_path) if dir_name.startswith('20') and '-' in dir_name]
+    return tuple(sorted(weeks, reverse=True))
+
+def get_weeks_from_folder(folder):
+    """Weeks available in folder, newest first; the folder is only re-listed when its mtime changes."""
+    try:
+        mtime_ns = os.stat(os.path.join(BASE_DIR, folder)).st_mtime_ns
+    except OSError:
+        return []
+    return list(_list_weeks(folder, mtime_ns))
 
 def get_current_week():
     year, week, _ = datetime.now().isocalendar()